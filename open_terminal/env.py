@@ -108,12 +108,14 @@ PROCESS_LOG_RETENTION: float = float(
 )
 
 # Minimum interval (in seconds) between log flushes during command execution.
-# 0 (default) = flush after every chunk (current behaviour).
-# Setting this to e.g. 1.0 reduces I/O pressure on high-output commands.
+# 0 = flush after every chunk (legacy behaviour, safest for low-throughput
+# commands). The default batches flushes so chatty commands don't issue one
+# write+flush syscall pair per output chunk; polls flush on demand, so
+# output visibility is unaffected.
 LOG_FLUSH_INTERVAL: float = float(
     os.environ.get(
         "OPEN_TERMINAL_LOG_FLUSH_INTERVAL",
-        config.get("log_flush_interval", 0),
+        config.get("log_flush_interval", 0.5),
     )
 )
 
@@ -122,7 +124,19 @@ LOG_FLUSH_INTERVAL: float = float(
 LOG_FLUSH_BUFFER: int = int(
     os.environ.get(
         "OPEN_TERMINAL_LOG_FLUSH_BUFFER",
-        config.get("log_flush_buffer", 0),
+        config.get("log_flush_buffer", 64 * 1024),
+    )
+)
+
+# Maximum number of background processes whose output is drained
+# concurrently.  Beyond this, new processes still start but their log
+# drain waits its turn — the OS pipe/pty buffers apply natural
+# backpressure — keeping event-loop scheduling cost bounded under a
+# burst of /execute calls.
+MAX_CONCURRENT_LOGGERS = int(
+    os.environ.get(
+        "OPEN_TERMINAL_MAX_CONCURRENT_LOGGERS",
+        config.get("max_concurrent_loggers", "128"),
     )
 )
 
@@ -1,26 +1,32 @@
 import asyncio
+import functools
+import heapq
 import hmac
 from importlib.metadata import version as _pkg_version
 import fnmatch
 import json
+import mimetypes
 
 import aiofiles
 import aiofiles.os
 import os
 import platform
 import re
-import shutil
 import signal
-import socket
 import sys
+import threading
 import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from dataclasses import dataclass, field
 from typing import Optional
+from urllib.parse import parse_qsl, urlencode
 
+import httpx
 from fastapi import Depends, FastAPI, File, HTTPException, Query, Request, UploadFile, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, Response
+from fastapi.responses import FileResponse, JSONResponse, Response
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from pydantic import BaseModel, Field
 
@@ -51,24 +57,38 @@ try:
 except ImportError:
     _PTY_AVAILABLE = False  # Windows
 
+try:
+    import re2 as _re2  # google-re2 — linear-time DFA engine, no backtracking
+
+    _RE2_AVAILABLE = True
+except ImportError:
+    _RE2_AVAILABLE = False
+
 
+# One uname() call shared by everything that reports system metadata:
+# the platform helpers can shell out on first use on some platforms, and
+# none of these values change for the process lifetime.
+_UNAME = platform.uname()
+
+
+@functools.cache
 def get_system_info() -> str:
     """Gather runtime system metadata for the OpenAPI description."""
     shell = os.environ.get("SHELL", "/bin/sh")
     user_part = f" as user '{os.getenv('USER', 'unknown')}'" if not MULTI_USER else ""
     return (
-        f"This system is running {platform.system()} {platform.release()} ({platform.machine()}) "
-        f"on {socket.gethostname()}{user_part} with {shell}. "
+        f"This system is running {_UNAME.system} {_UNAME.release} ({_UNAME.machine}) "
+        f"on {_UNAME.node}{user_part} with {shell}. "
         f"Python {sys.version.split()[0]} is available."
     )
 
 
 def _system_prompt_variables() -> dict[str, str]:
     return {
-        "os": platform.system(),
-        "kernel": platform.release(),
-        "arch": platform.machine(),
-        "hostname": socket.gethostname(),
+        "os": _UNAME.system,
+        "kernel": _UNAME.release,
+        "arch": _UNAME.machine,
+        "hostname": _UNAME.node,
         "user": "" if MULTI_USER else os.getenv("USER", "unknown"),
         "shell": os.environ.get("SHELL", "/bin/sh"),
         "python_version": sys.version.split()[0],
@@ -95,8 +115,8 @@ def get_system_prompt() -> str:
     user_part = f" as user '{os.getenv('USER', 'unknown')}'" if not MULTI_USER else ""
 
     prompt = (
-        f"You have access to a computer running {platform.system()} {platform.release()} ({platform.machine()}) "
-        f'on host "{socket.gethostname()}"{user_part} with {shell}. '
+        f"You have access to a computer running {_UNAME.system} {_UNAME.release} ({_UNAME.machine}) "
+        f'on host "{_UNAME.node}"{user_part} with {shell}. '
         f"Python {sys.version.split()[0]} is available.\n\n"
         "Use your tools to directly interact with the system \u2014 run commands, read and write files, "
         "and search the filesystem. "
@@ -165,15 +185,59 @@ def get_file_browser_root(fs: UserFS) -> dict[str, str] | None:
     return {"path": root_path, "label": label}
 
 
+class NullQueryParamMiddleware:
+    """Strip query parameters whose value is the literal string 'null'.
+
+    Implemented as a pure ASGI middleware (rather than ``@app.middleware``)
+    to avoid the per-request task and stream-bridging overhead of
+    Starlette's ``BaseHTTPMiddleware``.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            query_string = scope.get("query_string", b"")
+            # Fast path: a 'null' value can't be present without the token
+            # appearing somewhere in the raw bytes, so skip parsing entirely
+            # for the common case.
+            if query_string and b"null" in query_string.lower():
+                pairs = parse_qsl(query_string.decode("latin-1"), keep_blank_values=True)
+                cleaned = [(k, v) for k, v in pairs if v.lower() != "null"]
+                if len(cleaned) != len(pairs):
+                    scope["query_string"] = urlencode(cleaned).encode("latin-1")
+        await self.app(scope, receive, send)
+
+
+@asynccontextmanager
+async def _lifespan(app: FastAPI):
+    yield
+    # Close the pooled port-proxy client so shutdown releases its
+    # connections instead of leaking them.
+    global _port_proxy_client
+    if _port_proxy_client is not None:
+        await _port_proxy_client.aclose()
+        _port_proxy_client = None
+
+
 app = FastAPI(
     title="Open Terminal",
     description="A remote terminal API.",
     version=_pkg_version("open-terminal"),
+    lifespan=_lifespan,
 )
+app.add_middleware(NullQueryParamMiddleware)
+
+# Parse the origin list once at startup. With a plain "*" wildcard,
+# credentials are disabled so CORSMiddleware takes its explicit-wildcard
+# fast path (a static header set instead of per-request origin matching);
+# the CORS spec disallows credentials with a wildcard origin anyway.
+_cors_origins = tuple(o.strip() for o in CORS_ALLOWED_ORIGINS.split(","))
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=[o.strip() for o in CORS_ALLOWED_ORIGINS.split(",")],
-    allow_credentials=True,
+    allow_origins=list(_cors_origins),
+    allow_credentials=_cors_origins != ("*",),
     allow_methods=["*"],
     allow_headers=["*"],
 )
@@ -184,18 +248,6 @@ async def permission_error_handler(request: Request, exc: PermissionError):
     return JSONResponse(status_code=403, content={"detail": str(exc)})
 
 
-@app.middleware("http")
-async def normalize_null_query_params(request: Request, call_next):
-    """Strip query parameters whose value is the literal string 'null'."""
-    from urllib.parse import urlencode
-
-    raw_params = request.query_params.multi_items()
-    cleaned = [(k, v) for k, v in raw_params if v.lower() != "null"]
-    if len(cleaned) != len(raw_params):
-        request.scope["query_string"] = urlencode(cleaned).encode("utf-8")
-    return await call_next(request)
-
-
 # ---------------------------------------------------------------------------
 # Models
 # ---------------------------------------------------------------------------
@@ -305,11 +357,24 @@ class BackgroundProcess:
     log_task: Optional[asyncio.Task] = field(default=None, repr=False)
     finished_at: Optional[float] = field(default=None, repr=False)
     log_path: Optional[str] = field(default=None, repr=False)
+    log_writer: Optional["BoundedLogWriter"] = field(default=None, repr=False)
 
 
 _processes: dict[str, BackgroundProcess] = {}
 _EXPIRY_SECONDS = 300  # auto-clean finished processes after 5 min
 
+# Min-heap of (finished_at, process_id) so expiry pops only the entries
+# that actually expired instead of scanning every tracked process.
+_finish_queue: list[tuple[float, str]] = []
+
+
+def _track_finished(background_process: BackgroundProcess) -> None:
+    """Record a finished process for expiry-based cleanup."""
+    if background_process.finished_at is not None:
+        heapq.heappush(
+            _finish_queue, (background_process.finished_at, background_process.id)
+        )
+
 
 # ---------------------------------------------------------------------------
 # Per-session working directory tracking
@@ -345,8 +410,17 @@ def _set_session_cwd(session_id: str | None, path: str):
         _session_cwds[session_id] = (path, time.time())
 
 
-from open_terminal.utils.log import log_process, read_log
+from open_terminal.utils.log import BoundedLogWriter, log_process, read_log
+
 
+async def _flush_log(background_process: BackgroundProcess) -> None:
+    """Flush any batched log output so a subsequent read sees fresh data."""
+    writer = background_process.log_writer
+    if writer is not None:
+        try:
+            await writer.flush()
+        except ValueError:
+            pass  # log file already closed by log_process
 
 
 
@@ -356,14 +430,11 @@ def _cleanup_expired():
     Also deletes log files older than *LOG_RETENTION_SECONDS*.
     """
     now = time.time()
-    expired = [
-        process_id
-        for process_id, background_process in _processes.items()
-        if background_process.finished_at
-        and now - background_process.finished_at > _EXPIRY_SECONDS
-    ]
-    for process_id in expired:
-        bp = _processes.pop(process_id)
+    while _finish_queue and _finish_queue[0][0] < now - _EXPIRY_SECONDS:
+        _, process_id = heapq.heappop(_finish_queue)
+        bp = _processes.pop(process_id, None)
+        if bp is None:
+            continue  # already removed (e.g. killed explicitly)
         # Delete the log file if it has exceeded the retention period.
         if (
             bp.log_path
@@ -543,48 +614,58 @@ async def read_file(
         raise HTTPException(status_code=404, detail="File not found")
 
     try:
-        content = await fs.read_text(target)
-        lines = content.splitlines(keepends=True)
+        content, total_lines = await fs.read_text_range(
+            target, start_line or 1, end_line
+        )
     except (UnicodeDecodeError, ValueError):
-        import mimetypes
-
-        raw = await fs.read(target)
         mime, _ = mimetypes.guess_type(target)
         mime = mime or "application/octet-stream"
 
         # Try document text extraction (PDF, Office, OpenDocument, etc.)
-        from open_terminal.utils.documents import EXTRACTORS
+        from open_terminal.utils.documents import EXTRACTORS, extract_pdf, extract_pdf_range
 
         for ext_mime, ext_suffix, extractor in EXTRACTORS:
             if (ext_mime and mime == ext_mime) or (
                 ext_suffix and target.lower().endswith(ext_suffix)
             ):
-                text = await asyncio.to_thread(extractor, target)
+                # PDFs honour a line budget so a request for the first N
+                # lines doesn't extract every page of a large document.
+                # When extraction stops early, total_lines only covers the
+                # extracted prefix — truncated flags it as a lower bound.
+                extraction_complete = True
+                if extractor is extract_pdf and end_line is not None:
+                    text, extraction_complete = await asyncio.to_thread(
+                        extract_pdf_range, target, end_line
+                    )
+                else:
+                    text = await asyncio.to_thread(extractor, target)
                 lines = text.splitlines(keepends=True)
                 start = (start_line or 1) - 1
                 end = end_line or len(lines)
                 return {
                     "path": target,
                     "total_lines": len(lines),
+                    "truncated": not extraction_complete,
                     "content": "".join(lines[start:end]),
                 }
 
-        # Return raw binary for allowed mime type prefixes (e.g. image/*)
+        # Stream raw binary for allowed mime type prefixes (e.g. image/*).
+        # FileResponse sends the file in chunks (sendfile(2) where the
+        # event loop supports it) instead of buffering it in memory.
         if any(mime.startswith(prefix) for prefix in BINARY_FILE_MIME_PREFIXES):
-            return Response(content=raw, media_type=mime)
+            return FileResponse(target, media_type=mime)
 
         # Other binary files: reject (LLMs can't interpret raw bytes)
+        size = (await aiofiles.os.stat(target)).st_size
         raise HTTPException(
             status_code=415,
-            detail=f"Unsupported binary file type: {mime} ({len(raw)} bytes)",
+            detail=f"Unsupported binary file type: {mime} ({size} bytes)",
         )
 
-    start = (start_line or 1) - 1
-    end = end_line or len(lines)
     return {
         "path": target,
-        "total_lines": len(lines),
-        "content": "".join(lines[start:end]),
+        "total_lines": total_lines,
+        "content": content,
     }
 
 
@@ -635,12 +716,9 @@ async def view_file(
     if not await fs.isfile(target):
         raise HTTPException(status_code=404, detail="File not found")
 
-    import mimetypes
-
     mime, _ = mimetypes.guess_type(target)
     mime = mime or "application/octet-stream"
-    raw = await fs.read(target)
-    return Response(content=raw, media_type=mime)
+    return FileResponse(target, media_type=mime)
 
 
 @app.get(
@@ -667,11 +745,14 @@ async def write_file(http_request: Request, request: WriteRequest, fs: UserFS =
     session_id = http_request.headers.get("x-session-id")
     session_cwd = _get_session_cwd(session_id, fs) if session_id else None
     target = fs.resolve_path(request.path, cwd=session_cwd)
+    # Encode once: the encoded payload is both written and measured, avoiding
+    # a second full copy of the content just to report its size.
+    data = request.content.encode()
     try:
-        await fs.write(target, request.content)
+        await fs.write_bytes(target, data)
     except (OSError, subprocess.CalledProcessError) as e:
         raise HTTPException(status_code=400, detail=str(e))
-    return {"path": target, "size": len(request.content.encode())}
+    return {"path": target, "size": len(data)}
 
 
 @app.post(
@@ -734,6 +815,16 @@ async def move_entry(request: MoveRequest, fs: UserFS = Depends(get_filesystem))
     return {"source": source, "destination": destination}
 
 
+def _line_starts(content: str) -> list[int]:
+    """Return the character offset of each line start in *content*."""
+    starts = [0]
+    idx = content.find("\n")
+    while idx != -1:
+        starts.append(idx + 1)
+        idx = content.find("\n", idx + 1)
+    return starts
+
+
 @app.post(
     "/files/replace",
     operation_id="replace_file_content",
@@ -758,12 +849,25 @@ async def replace_file_content(http_request: Request, request: ReplaceRequest, f
     except OSError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+    # Line ranges are resolved through a newline-offset index instead of
+    # splitting the whole file into a list of line strings for every chunk:
+    # one scan yields integer offsets, and ranged edits become three string
+    # slices. The index is invalidated after each edit and rebuilt lazily
+    # only if a later chunk needs it.
+    line_starts: Optional[list[int]] = None
+
     for chunk in request.replacements:
-        if chunk.start_line or chunk.end_line:
-            lines = content.splitlines(keepends=True)
+        ranged = bool(chunk.start_line or chunk.end_line)
+        if ranged:
+            if line_starts is None:
+                line_starts = _line_starts(content)
             start = (chunk.start_line or 1) - 1
-            end = chunk.end_line or len(lines)
-            search_region = "".join(lines[start:end])
+            end = chunk.end_line or len(line_starts)
+            start_offset = (
+                line_starts[start] if start < len(line_starts) else len(content)
+            )
+            end_offset = line_starts[end] if end < len(line_starts) else len(content)
+            search_region = content[start_offset:end_offset]
         else:
             search_region = content
 
@@ -779,19 +883,20 @@ async def replace_file_content(http_request: Request, request: ReplaceRequest, f
                 detail=f"Found {count} occurrences of target string but allow_multiple is false",
             )
 
-        if chunk.start_line or chunk.end_line:
+        if ranged:
             new_region = search_region.replace(chunk.target, chunk.replacement)
-            lines[start:end] = [new_region]
-            content = "".join(lines)
+            content = content[:start_offset] + new_region + content[end_offset:]
         else:
             content = content.replace(chunk.target, chunk.replacement)
+        line_starts = None  # offsets have shifted
 
+    data = content.encode()
     try:
-        await fs.write(target, content)
+        await fs.write_bytes(target, data)
     except OSError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
-    return {"path": target, "size": len(content.encode())}
+    return {"path": target, "size": len(data)}
 
 
 @app.get(
@@ -833,14 +938,39 @@ async def grep_search(
     if not await aiofiles.os.path.exists(target):
         raise HTTPException(status_code=404, detail="Search path not found")
 
-    flags = re.IGNORECASE if case_insensitive else 0
-    if regex:
+    # Literal case-sensitive searches skip the regex engine entirely:
+    # bytes membership is a tuned C substring search (Two-Way algorithm),
+    # several times faster than running re.search on every line.
+    literal = not regex and not case_insensitive
+    query_bytes = query.encode()
+
+    pattern = None
+    # MULTILINE keeps ^/$ anchored to line boundaries now that matching
+    # runs over the whole file buffer rather than line by line.
+    flags = re.MULTILINE | (re.IGNORECASE if case_insensitive else 0)
+    if literal:
+        pass
+    elif regex:
+        # Patterns are compiled as bytes so files can be scanned without
+        # decoding them first (case folding is ASCII-only in bytes mode).
         try:
-            pattern = re.compile(query, flags)
+            pattern = re.compile(query_bytes, flags)
         except re.error as exc:
             raise HTTPException(status_code=400, detail=f"Invalid regex: {exc}")
+        # Prefer RE2 when installed: Python's re is a backtracking engine
+        # and dominates CPU when grepping large trees, while RE2 scans in
+        # linear time. Patterns RE2 can't express (backreferences,
+        # lookaround) keep the stdlib engine.
+        if _RE2_AVAILABLE:
+            # google-re2 takes an re2.Options object, not stdlib flag ints;
+            # inline flags express MULTILINE/IGNORECASE portably instead.
+            inline = b"(?mi)" if case_insensitive else b"(?m)"
+            try:
+                pattern = _re2.compile(inline + query_bytes)
+            except _re2.error:
+                pass
     else:
-        pattern = re.compile(re.escape(query), flags)
+        pattern = re.compile(re.escape(query_bytes), flags)
 
     def _search_sync():
         def _matches_include(filename: str) -> bool:
@@ -848,56 +978,128 @@ async def grep_search(
                 return True
             return any(fnmatch.fnmatch(filename, glob) for glob in include)
 
-        matches = []
-        truncated = False
+        # Files are independent, so they are grepped in parallel worker
+        # threads (reads and the regex scan both release the GIL).  A shared
+        # counter trips *stop* once enough matches exist so that in-flight
+        # workers can short-circuit.
+        stop = threading.Event()
+        counter_lock = threading.Lock()
+        found_count = 0
+
+        def _note_match():
+            nonlocal found_count
+            with counter_lock:
+                found_count += 1
+                if found_count >= max_results:
+                    stop.set()
+
+        def _search_file(file_path: str) -> list[dict]:
+            # Scan the whole buffer at C level instead of iterating Python
+            # line objects: one read, one find/finditer-style pass, and
+            # line numbers derived from newline counts up to each hit.
+            found: list[dict] = []
+            if stop.is_set():
+                return found
+            try:
+                with open(file_path, "rb") as f:
+                    data = f.read()
+            except OSError:
+                return found  # skip unreadable files
+            if b"\x00" in data[:8192]:
+                return found  # skip binary files
+
+            line_no = 1
+            counted = 0  # offset up to which newlines have been counted
+            pos = 0
+            while not stop.is_set():
+                if literal:
+                    start = data.find(query_bytes, pos)
+                    if start < 0:
+                        break
+                    end = start + len(query_bytes)
+                else:
+                    m = pattern.search(data, pos)
+                    if m is None:
+                        break
+                    start, end = m.start(), m.end()
+
+                line_no += data.count(b"\n", counted, start)
+                counted = start
+                line_start = data.rfind(b"\n", 0, start) + 1
+                line_end = data.find(b"\n", end)
+                if line_end < 0:
+                    line_end = len(data)
+                try:
+                    content = data[line_start:line_end].decode("utf-8")
+                except UnicodeDecodeError:
+                    return []  # skip binary files
 
-        def _search_file(file_path: str):
-            nonlocal truncated
-            if truncated:
-                return
+                if match_per_line:
+                    found.append(
+                        {
+                            "file": file_path,
+                            "line": line_no,
+                            "content": content.rstrip("\n\r"),
+                        }
+                    )
+                    _note_match()
+                else:
+                    found.append({"file": file_path})
+                    _note_match()
+                    return found  # one match per file is enough
+
+                # Continue after this line so a line with several hits
+                # still produces a single entry, as before.
+                pos = line_end + 1
+            return found
+
+        def _iter_files(root: str):
+            """Yield candidate file paths depth-first via os.scandir.
+
+            DirEntry carries the joined path and cached type information,
+            so the walk avoids the per-name os.path.join and extra stat
+            syscalls that os.walk-based iteration incurred.  The include
+            filter is applied to entry names before any further work.
+            """
+            subdirs = []
             try:
-                with open(file_path, "r", encoding="utf-8", errors="strict") as f:
-                    for line_number, line in enumerate(f, 1):
-                        if pattern.search(line):
-                            if match_per_line:
-                                matches.append(
-                                    {
-                                        "file": file_path,
-                                        "line": line_number,
-                                        "content": line.rstrip("\n\r"),
-                                    }
-                                )
-                                if len(matches) >= max_results:
-                                    truncated = True
-                                    return
-                            else:
-                                matches.append({"file": file_path})
-                                if len(matches) >= max_results:
-                                    truncated = True
-                                return  # one match per file is enough
-            except (UnicodeDecodeError, ValueError, OSError):
-                pass  # skip binary or unreadable files
+                with os.scandir(root) as it:
+                    entries = sorted(it, key=lambda e: e.name)
+            except OSError:
+                return
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        # Prune directories belonging to other users.
+                        if fs.is_path_allowed(entry.path):
+                            subdirs.append(entry.path)
+                        continue
+                except OSError:
+                    continue
+                if not _matches_include(entry.name):
+                    continue
+                if not fs.is_path_allowed(entry.path):
+                    continue
+                yield entry.path
+            for sub in subdirs:
+                yield from _iter_files(sub)
 
         if os.path.isfile(target):
-            _search_file(target)
+            matches = _search_file(target)
         else:
-            for dirpath, dirnames, filenames in os.walk(target):
-                # Prune directories belonging to other users.
-                dirnames[:] = [
-                    d for d in dirnames
-                    if fs.is_path_allowed(os.path.join(dirpath, d))
-                ]
-                if truncated:
-                    break
-                for filename in sorted(filenames):
-                    if not _matches_include(filename):
-                        continue
-                    full = os.path.join(dirpath, filename)
-                    if not fs.is_path_allowed(full):
-                        continue
-                    _search_file(full)
-
-        return matches, truncated
+            candidates = list(_iter_files(target))
+            matches = []
+            if candidates:
+                workers = min(32, len(candidates))
+                with ThreadPoolExecutor(max_workers=workers) as pool:
+                    # Collect per-file results and concatenate in walk
+                    # order so output stays deterministic despite the
+                    # parallel scan.
+                    for future in [pool.submit(_search_file, p) for p in candidates]:
+                        matches.extend(future.result())
+
+        truncated = len(matches) >= max_results
+        return matches[:max_results], truncated
 
     matches, truncated = await asyncio.to_thread(_search_sync)
     return {
@@ -946,44 +1148,57 @@ async def glob_search(
         matches = []
         truncated = False
 
-        for dirpath, dirnames, filenames in os.walk(target):
-            if truncated:
-                break
+        def _walk(dirpath: str):
+            # Recursive os.scandir walk: DirEntry provides the joined path
+            # plus cached is_dir()/stat() results, avoiding the per-entry
+            # os.path.join and duplicate stat syscalls of os.walk-based
+            # iteration.
+            nonlocal truncated
+            try:
+                with os.scandir(dirpath) as it:
+                    entries = sorted(it, key=lambda e: e.name)
+            except OSError:
+                return
 
-            # Prune directories belonging to other users.
-            dirnames[:] = [
-                d for d in dirnames
-                if fs.is_path_allowed(os.path.join(dirpath, d))
-            ]
+            subdirs = []
+            for entry in entries:
+                if truncated:
+                    return
 
-            entries = []
-            if type in ("any", "directory"):
-                entries.extend([(d, "directory") for d in dirnames])
-            if type in ("any", "file"):
-                entries.extend([(f, "file") for f in filenames])
+                try:
+                    is_dir = entry.is_dir()
+                    descend = entry.is_dir(follow_symlinks=False)
+                except OSError:
+                    is_dir = descend = False
 
-            for name, entry_type in sorted(entries, key=lambda x: x[0]):
-                if truncated:
-                    break
+                if is_dir:
+                    # Prune directories belonging to other users.
+                    if not fs.is_path_allowed(entry.path):
+                        continue
+                    if descend:
+                        subdirs.append(entry.path)
 
-                full_path = os.path.join(dirpath, name)
-                rel_path = os.path.relpath(full_path, target)
+                entry_type = "directory" if is_dir else "file"
+                if type not in ("any", entry_type):
+                    continue
+
+                rel_path = os.path.relpath(entry.path, target)
 
                 # Check inclusion pattern
-                if not fnmatch.fnmatch(name, pattern) and not fnmatch.fnmatch(
+                if not fnmatch.fnmatch(entry.name, pattern) and not fnmatch.fnmatch(
                     rel_path, pattern
                 ):
                     continue
 
                 # Check exclusion patterns
                 if exclude and any(
-                    fnmatch.fnmatch(name, excl) or fnmatch.fnmatch(rel_path, excl)
+                    fnmatch.fnmatch(entry.name, excl) or fnmatch.fnmatch(rel_path, excl)
                     for excl in exclude
                 ):
                     continue
 
                 try:
-                    file_stat = os.stat(full_path)
+                    file_stat = entry.stat()
                     matches.append(
                         {
                             "path": rel_path,
@@ -995,10 +1210,16 @@ async def glob_search(
 
                     if len(matches) >= max_results:
                         truncated = True
-                        break
+                        return
                 except OSError:
                     pass
 
+            for sub in subdirs:
+                if truncated:
+                    return
+                _walk(sub)
+
+        _walk(target)
         return matches, truncated
 
     matches, truncated = await asyncio.to_thread(_glob_sync)
@@ -1030,20 +1251,25 @@ async def upload_file(
     ),
     fs: UserFS = Depends(get_filesystem),
 ):
-    content = await file.read()
     filename = os.path.basename(file.filename or "upload")
 
     directory = fs.resolve_path(directory)
     path = os.path.normpath(os.path.join(directory, filename))
 
+    # Stream the upload straight to disk instead of buffering the whole
+    # payload in memory first.
+    async def _chunks():
+        while chunk := await file.read(1 << 20):
+            yield chunk
+
     try:
         await fs.mkdir(directory)
-        await fs.write_bytes(path, content)
+        size = await fs.write_chunks(path, _chunks())
     except PermissionError as e:
         raise HTTPException(status_code=403, detail=str(e))
     except OSError as e:
         raise HTTPException(status_code=400, detail=str(e))
-    return {"path": path, "size": len(content)}
+    return {"path": path, "size": size}
 
 
 class ArchiveRequest(BaseModel):
@@ -1185,20 +1411,25 @@ async def execute(
         id=process_id, command=request.command, runner=runner, log_path=log_path
     )
     background_process.log_task = asyncio.create_task(log_process(background_process))
+    background_process.log_task.add_done_callback(
+        lambda _task: _track_finished(background_process)
+    )
     _processes[process_id] = background_process
 
     if wait is None and EXECUTE_TIMEOUT:
         wait = EXECUTE_TIMEOUT
     if wait is not None:
-        try:
-            await asyncio.wait_for(
-                asyncio.shield(background_process.log_task), timeout=wait
-            )
-        except asyncio.TimeoutError:
-            pass
+        # asyncio.wait never cancels the task — no shield wrapper, no
+        # TimeoutError plumbing; on timeout the done set is simply empty.
+        await asyncio.wait({background_process.log_task}, timeout=wait)
 
+    await _flush_log(background_process)
+    log_writer = background_process.log_writer
     output, next_offset, truncated = await read_log(
-        background_process.log_path, offset=0, tail=tail
+        background_process.log_path,
+        offset=0,
+        tail=tail,
+        index=log_writer.entry_offsets if log_writer else None,
     )
 
     return {
@@ -1248,15 +1479,15 @@ async def get_status(
     if wait is None and EXECUTE_TIMEOUT:
         wait = EXECUTE_TIMEOUT
     if wait is not None and background_process.status == "running":
-        try:
-            await asyncio.wait_for(
-                asyncio.shield(background_process.log_task), timeout=wait
-            )
-        except asyncio.TimeoutError:
-            pass
+        await asyncio.wait({background_process.log_task}, timeout=wait)
 
+    await _flush_log(background_process)
+    log_writer = background_process.log_writer
     output, next_offset, truncated = await read_log(
-        background_process.log_path, offset=offset, tail=tail
+        background_process.log_path,
+        offset=offset,
+        tail=tail,
+        index=log_writer.entry_offsets if log_writer else None,
     )
 
     return {
@@ -1271,6 +1502,36 @@ async def get_status(
     }
 
 
+# Literal escape sequences LLMs commonly emit in stdin payloads.
+_ESC_MAP = {
+    "n": "\n", "t": "\t", "r": "\r", "a": "\a",
+    "b": "\b", "f": "\f", "v": "\v", "\\": "\\", "'": "'", '"': '"',
+}
+_ESC_RE = re.compile(r"\\(x[0-9a-fA-F]{2}|u[0-9a-fA-F]{4}|[0-7]{1,3}|[ntrabfv\\'\"])")
+
+
+def _expand_escapes(text: str) -> str:
+    """Expand literal escape sequences (``\\n``, ``\\x03``, ``\\033``, …).
+
+    A single regex pass replaces the old round-trip through the
+    raw_unicode_escape/unicode_escape codecs, which allocated two
+    intermediate objects and ran a codec state machine over the whole
+    payload; inputs without a backslash skip even the regex.
+    """
+    if "\\" not in text:
+        return text
+
+    def _replace(match: re.Match) -> str:
+        seq = match.group(1)
+        if seq[0] in ("x", "u"):
+            return chr(int(seq[1:], 16))
+        if seq[0] in "01234567":
+            return chr(int(seq, 8))
+        return _ESC_MAP[seq]
+
+    return _ESC_RE.sub(_replace, text)
+
+
 @app.post(
     "/execute/{process_id}/input",
     operation_id="send_process_input",
@@ -1290,10 +1551,10 @@ async def send_input(process_id: str, body: InputRequest):
 
     # Convert literal escape sequences (\n, \x03 for Ctrl-C, etc.) into real
     # characters — LLMs often emit these as literal strings.
-    text = body.input.encode("raw_unicode_escape").decode("unicode_escape")
+    text = _expand_escapes(body.input)
 
     try:
-        background_process.runner.write_input(text.encode())
+        await background_process.runner.write_input(text.encode())
         if isinstance(background_process.runner, PipeRunner):
             await background_process.runner.drain_input()
     except (BrokenPipeError, ConnectionResetError, OSError):
@@ -1320,14 +1581,23 @@ async def kill_process(
     background_process = _get_process(process_id)
     if background_process.status == "running":
         background_process.runner.kill(force=force)
-        exit_code = await background_process.runner.wait()
-        background_process.runner.close()
-        background_process.status = "killed"
-        background_process.exit_code = exit_code
+        # Reap in the background: a process ignoring SIGTERM would
+        # otherwise hold the HTTP request open for its whole grace period.
+        asyncio.create_task(_finalize_kill(process_id, background_process))
+        return {"status": "killing"}
     del _processes[process_id]
     return {"status": "killed"}
 
 
+async def _finalize_kill(process_id: str, background_process: BackgroundProcess) -> None:
+    """Wait for a signalled process to exit, then record it and drop it."""
+    exit_code = await background_process.runner.wait()
+    background_process.runner.close()
+    background_process.status = "killed"
+    background_process.exit_code = exit_code
+    _processes.pop(process_id, None)
+
+
 # ---------------------------------------------------------------------------
 # Port detection & proxy
 # ---------------------------------------------------------------------------
@@ -1381,7 +1651,6 @@ _port_proxy_client = None
 async def _get_port_proxy_client():
     global _port_proxy_client
     if _port_proxy_client is None:
-        import httpx
         _port_proxy_client = httpx.AsyncClient(
             timeout=httpx.Timeout(300.0, connect=5.0),
             follow_redirects=False,
@@ -1411,8 +1680,6 @@ async def port_proxy(port: int, path: str, request: Request):
 
     body = await request.body()
 
-    import httpx
-
     client = await _get_port_proxy_client()
     try:
         upstream = await client.request(
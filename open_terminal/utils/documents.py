@@ -12,10 +12,32 @@ import zipfile
 
 def extract_pdf(file_path: str) -> str:
     """Extract text from a PDF file."""
+    text, _ = extract_pdf_range(file_path)
+    return text
+
+
+def extract_pdf_range(file_path: str, max_lines: int | None = None) -> tuple[str, bool]:
+    """Extract text from a PDF file, stopping once *max_lines* have accumulated.
+
+    Page extraction is CPU-heavy, so a caller that only wants the first N
+    lines shouldn't pay for every page of a large document.  Returns
+    ``(text, complete)``; *complete* is ``False`` when pages were left
+    unextracted, i.e. the text covers only a prefix of the document.
+    """
     from pypdf import PdfReader
 
     reader = PdfReader(file_path)
-    return "\n".join(page.extract_text() or "" for page in reader.pages)
+    parts = []
+    line_count = 0
+    last_page = len(reader.pages) - 1
+    for i, page in enumerate(reader.pages):
+        text = page.extract_text() or ""
+        parts.append(text)
+        if max_lines is not None:
+            line_count += text.count("\n") + 1
+            if line_count >= max_lines:
+                return "\n".join(parts), i == last_page
+    return "\n".join(parts), True
 
 
 def extract_docx(file_path: str) -> str:
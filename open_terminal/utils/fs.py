@@ -15,10 +15,24 @@ import asyncio
 import os
 import shutil
 import subprocess
+from collections.abc import AsyncIterable
 
 import aiofiles
 import aiofiles.os
 
+# The server's working directory never changes after startup (per-session
+# cwds are tracked in memory, not via os.chdir), so capture it once.
+# os.path.abspath re-runs the getcwd() syscall on every call; with the
+# cached value, resolving a path is pure string work.
+_SERVER_CWD = os.getcwd()
+
+
+def _abspath(path: str) -> str:
+    """``os.path.abspath`` without the per-call ``getcwd()`` syscall."""
+    if not os.path.isabs(path):
+        path = os.path.join(_SERVER_CWD, path)
+    return os.path.normpath(path)
+
 
 class UserFS:
     """Filesystem operations scoped to an optional OS user.
@@ -32,7 +46,7 @@ class UserFS:
 
     def __init__(self, username: str | None = None, home: str | None = None):
         self.username = username
-        self.home = home or os.getcwd()
+        self.home = home or _SERVER_CWD
 
     # ------------------------------------------------------------------
     # Path resolution
@@ -72,7 +86,7 @@ class UserFS:
         """Return *False* if *path* is inside another user's home directory."""
         if not self.username:
             return True
-        resolved = os.path.abspath(path)
+        resolved = _abspath(path)
         if not resolved.startswith("/home/"):
             return True
         parts = resolved.split("/")  # ['', 'home', '<user>', ...]
@@ -87,7 +101,7 @@ class UserFS:
         """Reject paths inside another user's home directory."""
         if not self.is_path_allowed(path):
             raise PermissionError(
-                f"Access denied: {os.path.abspath(path)} belongs to another user"
+                f"Access denied: {_abspath(path)} belongs to another user"
             )
 
     async def _chown(self, path: str) -> None:
@@ -144,17 +158,67 @@ class UserFS:
     # Read operations
     # ------------------------------------------------------------------
 
+    @staticmethod
+    def _read_sync(path: str) -> bytes:
+        """One-shot open/read/close, run inside a single worker-thread hop.
+
+        aiofiles proxies *each* method call (open, read, close) through the
+        thread pool separately; for a whole-file read that's three hops and
+        three loop round-trips where one suffices.
+        """
+        with open(path, "rb") as f:
+            return f.read()
+
     async def read(self, path: str) -> bytes:
         """Read raw bytes from *path*."""
         self._check_path(path)
-        async with aiofiles.open(path, "rb") as f:
-            return await f.read()
+        return await asyncio.to_thread(self._read_sync, path)
 
     async def read_text(self, path: str, encoding: str = "utf-8") -> str:
-        """Read text from *path*."""
+        """Read text from *path*.
+
+        Reads raw bytes and decodes in one shot: incremental text-mode
+        decoding runs chunk by chunk, whereas a single C-level decode of
+        the full buffer is substantially cheaper for files beyond a few KB.
+        """
+        self._check_path(path)
+        raw = await asyncio.to_thread(self._read_sync, path)
+        return raw.decode(encoding)
+
+    async def read_text_range(
+        self,
+        path: str,
+        start_line: int = 1,
+        end_line: int | None = None,
+        encoding: str = "utf-8",
+    ) -> tuple[str, int]:
+        """Read lines *start_line*..*end_line* (1-indexed, inclusive) from *path*.
+
+        Returns ``(content, total_lines)``.  The file is streamed line by
+        line; lines outside the requested range are counted but never
+        accumulated, so memory stays proportional to the range rather than
+        the file size.
+        """
         self._check_path(path)
-        async with aiofiles.open(path, "r", encoding=encoding, errors="strict") as f:
-            return await f.read()
+
+        def _read_range_sync() -> tuple[str, int]:
+            # One worker-thread hop for the whole scan: iterating an
+            # aiofiles handle would dispatch every readline through the
+            # thread pool separately, which dwarfs the read itself on
+            # files with many lines.
+            selected: list[str] = []
+            line_no = 0
+            # newline="" returns lines with their original endings (\r\n is
+            # still recognized as one line break) so CRLF files round-trip
+            # byte-for-byte, matching read_text.
+            with open(path, "r", encoding=encoding, errors="strict", newline="") as f:
+                for line in f:
+                    line_no += 1
+                    if line_no >= start_line and (end_line is None or line_no <= end_line):
+                        selected.append(line)
+            return "".join(selected), line_no
+
+        return await asyncio.to_thread(_read_range_sync)
 
     async def exists(self, path: str) -> bool:
         """Check if *path* exists."""
@@ -185,21 +249,25 @@ class UserFS:
         """List directory contents with type, size, and mtime."""
         self._check_path(path)
         def _list_sync():
+            # os.scandir caches stat/is_dir results on each DirEntry, so a
+            # directory listing costs one getdents pass instead of two extra
+            # syscalls (stat + isdir) per entry.
             entries = []
-            for name in sorted(os.listdir(path)):
-                full = os.path.join(path, name)
-                if not self.is_path_allowed(full):
-                    continue
-                try:
-                    s = os.stat(full)
-                    entries.append({
-                        "name": name,
-                        "type": "directory" if os.path.isdir(full) else "file",
-                        "size": s.st_size,
-                        "modified": s.st_mtime,
-                    })
-                except OSError:
-                    continue
+            with os.scandir(path) as it:
+                for entry in it:
+                    if not self.is_path_allowed(entry.path):
+                        continue
+                    try:
+                        s = entry.stat()
+                        entries.append({
+                            "name": entry.name,
+                            "type": "directory" if entry.is_dir() else "file",
+                            "size": s.st_size,
+                            "modified": s.st_mtime,
+                        })
+                    except OSError:
+                        continue
+            entries.sort(key=lambda e: e["name"])
             return entries
         return await asyncio.to_thread(_list_sync)
 
@@ -251,6 +319,24 @@ class UserFS:
             await f.write(data)
         await self._chown(path)
 
+    async def write_chunks(self, path: str, chunks: AsyncIterable[bytes]) -> int:
+        """Write an async iterable of byte *chunks* to *path*, creating parent dirs.
+
+        Returns the total number of bytes written.  Streaming chunk by chunk
+        keeps peak memory at one chunk regardless of the payload size.
+        """
+        self._check_path(path)
+        parent = os.path.dirname(path)
+        if parent:
+            await self._ensure_parents(parent)
+        size = 0
+        async with aiofiles.open(path, "wb") as f:
+            async for chunk in chunks:
+                await f.write(chunk)
+                size += len(chunk)
+        await self._chown(path)
+        return size
+
     async def mkdir(self, path: str) -> None:
         """Create directory *path* and parents."""
         self._check_path(path)
@@ -4,60 +4,168 @@ Handles writing, reading, and capping JSONL log files for background
 processes.  Extracted from ``main.py`` to keep the route module focused.
 """
 
+import asyncio
 import json
 import os
+import threading
 import time
+from collections import deque
 from typing import Optional
 
 import aiofiles
 import aiofiles.os
+import orjson
 
-from open_terminal.env import MAX_PROCESS_LOG_SIZE, LOG_FLUSH_INTERVAL, LOG_FLUSH_BUFFER
+from open_terminal.env import (
+    MAX_PROCESS_LOG_SIZE,
+    LOG_FLUSH_INTERVAL,
+    LOG_FLUSH_BUFFER,
+    MAX_CONCURRENT_LOGGERS,
+)
+
+# Caps how many processes have their output drained at once, so an
+# /execute burst can't fan out into unbounded concurrent drain loops.
+_logger_semaphore = asyncio.Semaphore(MAX_CONCURRENT_LOGGERS)
+
+# Serialized prefixes identifying output records (orjson emits compact
+# JSON with keys in insertion order, so the prefix is stable).
+_OUTPUT_PREFIXES = (b'{"type":"output"', b'{"type":"stdout"', b'{"type":"stderr"')
+_OUTPUT_PREFIXES_STR = ('{"type":"output"', '{"type":"stdout"', '{"type":"stderr"')
+
+
+class _LogWriteThread(threading.Thread):
+    """Background thread draining queued records to a raw fd with ``os.writev``.
+
+    The event-loop side produces by appending to a deque — a non-blocking
+    push with no await and no thread-pool round-trip.  The drain loop
+    gathers everything queued since its last wakeup and lands it in one
+    ``writev`` call, so many records cost a single syscall.
+    """
+
+    _MAX_IOV = 1024  # conservative IOV_MAX; writev batches are capped here
+
+    def __init__(self, fd: int):
+        super().__init__(daemon=True, name="log-writer")
+        self._fd = fd
+        self._queue: deque[bytes] = deque()
+        self._cond = threading.Condition()
+        self._busy = False
+        self._closed = False
+
+    def push(self, bufs: list[bytes]) -> None:
+        """Queue *bufs* for writing. Non-blocking; safe from the event loop."""
+        with self._cond:
+            self._queue.extend(bufs)
+            self._cond.notify()
+
+    def drain(self) -> None:
+        """Block until everything queued so far has reached the fd."""
+        with self._cond:
+            while self._queue or self._busy:
+                self._cond.wait()
+
+    def close(self) -> None:
+        """Drain remaining records and stop the thread."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self.join()
+
+    def run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._queue and not self._closed:
+                    self._cond.wait()
+                if not self._queue:
+                    return  # closed and fully drained
+                bufs = []
+                while self._queue and len(bufs) < self._MAX_IOV:
+                    bufs.append(self._queue.popleft())
+                self._busy = True
+            try:
+                self._writev(bufs)
+            except OSError:
+                pass  # disk full / fd gone — drop the batch, keep the process alive
+            with self._cond:
+                self._busy = False
+                self._cond.notify_all()
+
+    def _writev(self, bufs: list[bytes]) -> None:
+        # writev may write partially; advance past fully-written buffers
+        # and re-slice the boundary one before retrying.
+        while bufs:
+            written = os.writev(self._fd, bufs)
+            while bufs and written >= len(bufs[0]):
+                written -= len(bufs[0])
+                bufs.pop(0)
+            if bufs and written:
+                bufs[0] = bufs[0][written:]
 
 
 class BoundedLogWriter:
-    """Async wrapper that rotates the log file when it exceeds a size limit.
+    """Log writer that rotates the file when it exceeds a size limit.
 
     When the total bytes written surpass *MAX_PROCESS_LOG_SIZE*, the file
     is truncated to its newest half and a ``log_rotated`` marker is inserted.
     Writing then continues, so the most recent output is always available.
 
-    Flushing behaviour is controlled by *flush_interval* and *flush_buffer*:
+    Records land on disk through a raw ``O_APPEND`` fd fed by a background
+    :class:`_LogWriteThread`, so the event-loop side never blocks on file
+    I/O.  *flush_interval* and *flush_buffer* control how often buffered
+    records are handed to the thread:
 
-    * ``flush_interval=0`` (default) — flush after every write (original
-      behaviour, safest for low-throughput commands).
-    * ``flush_interval>0`` — flush at most once per *flush_interval* seconds,
-      **or** when the unflushed buffer exceeds *flush_buffer* bytes (if set).
-      This dramatically reduces I/O pressure for high-output commands.
+    * ``flush_interval=0`` (default) — hand off and wait after every write
+      (original behaviour, safest for low-throughput commands).
+    * ``flush_interval>0`` — hand off at most once per *flush_interval*
+      seconds, **or** when the buffer exceeds *flush_buffer* bytes (if set).
     """
 
     __slots__ = (
-        "_file", "_log_path", "_bytes_written", "rotated",
+        "_fd", "_thread", "_log_path", "_bytes_written", "rotated", "_closed",
         "_flush_interval", "_flush_buffer", "_unflushed", "_last_flush",
+        "_buffer", "entry_offsets",
     )
 
-    def __init__(self, file, log_path: str, *, flush_interval: float = 0, flush_buffer: int = 0):
-        self._file = file
+    def __init__(self, fd: int, log_path: str, *, flush_interval: float = 0, flush_buffer: int = 0):
+        self._fd = fd
+        self._thread = _LogWriteThread(fd)
+        self._thread.start()
         self._log_path = log_path
         self._bytes_written = 0
         self.rotated = False
+        self._closed = False
         self._flush_interval = flush_interval
         self._flush_buffer = flush_buffer
         self._unflushed = 0
         self._last_flush = time.monotonic()
+        # Records accumulate here between hand-offs so the writer thread
+        # isn't woken for every individual record.
+        self._buffer: list[bytes] = []
+        # Byte offset of every output/stdout/stderr record, in write order.
+        # read_log uses this to seek straight to the requested entry
+        # instead of re-counting records from the top of the file per poll.
+        self.entry_offsets: list[int] = []
+
+    @classmethod
+    async def open(cls, log_path: str, *, flush_interval: float = 0, flush_buffer: int = 0) -> "BoundedLogWriter":
+        """Open (or create) *log_path* for appending and return a writer."""
+        fd = await asyncio.to_thread(
+            os.open, log_path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644
+        )
+        return cls(fd, log_path, flush_interval=flush_interval, flush_buffer=flush_buffer)
 
-    async def write(self, data: str) -> None:
-        encoded_len = len(data.encode("utf-8", errors="replace"))
-        if self._bytes_written + encoded_len > MAX_PROCESS_LOG_SIZE:
+    async def write(self, data: bytes) -> None:
+        if self._bytes_written + len(data) > MAX_PROCESS_LOG_SIZE:
             await self._rotate()
-        await self._file.write(data)
-        self._bytes_written += encoded_len
-        self._unflushed += encoded_len
+        if data.startswith(_OUTPUT_PREFIXES):
+            self.entry_offsets.append(self._bytes_written)
+        self._buffer.append(data)
+        self._bytes_written += len(data)
+        self._unflushed += len(data)
 
         if self._flush_interval <= 0:
-            # Legacy behaviour: flush on every write.
-            await self._file.flush()
-            self._unflushed = 0
+            # Legacy behaviour: land every record before returning.
+            await self.flush()
             return
 
         now = time.monotonic()
@@ -65,38 +173,65 @@ class BoundedLogWriter:
         if not should_flush and self._flush_buffer > 0:
             should_flush = self._unflushed >= self._flush_buffer
         if should_flush:
-            await self._file.flush()
+            self._push_buffer()
             self._unflushed = 0
             self._last_flush = now
 
+    def _push_buffer(self) -> None:
+        if self._buffer:
+            self._thread.push(self._buffer)
+            self._buffer = []
+
     async def flush(self) -> None:
-        await self._file.flush()
+        """Hand buffered records to the writer thread and wait until they land."""
+        if self._closed:
+            raise ValueError("log writer is closed")
+        self._push_buffer()
+        await asyncio.to_thread(self._thread.drain)
         self._unflushed = 0
         self._last_flush = time.monotonic()
 
+    async def close(self) -> None:
+        """Drain outstanding records, stop the writer thread, and close the fd."""
+        if self._closed:
+            return
+        self._closed = True
+        self._push_buffer()
+        await asyncio.to_thread(self._thread.close)
+        os.close(self._fd)
+
     async def _rotate(self) -> None:
         """Keep the newest half of the log file and continue writing."""
         self.rotated = True
-        await self._file.flush()
-        # Close, rewrite, and reopen.
-        await self._file.close()
-
-        async with aiofiles.open(self._log_path, "r", encoding="utf-8") as f:
-            lines = await f.readlines()
-
-        # Keep the newest half of output lines.
-        keep = lines[len(lines) // 2 :]
-
-        async with aiofiles.open(self._log_path, "w", encoding="utf-8") as f:
-            await f.write(
-                json.dumps({"type": "log_rotated", "ts": time.time()}) + "\n"
-            )
+        self._push_buffer()
+        # Stop the writer thread (drains the queue), rewrite the file
+        # synchronously off-loop, then reopen and restart.
+        await asyncio.to_thread(self._thread.close)
+
+        def _rewrite() -> tuple[int, int, list[int]]:
+            os.close(self._fd)
+            with open(self._log_path, "r", encoding="utf-8") as f:
+                lines = f.readlines()
+            # Keep the newest half of output lines.
+            keep = lines[len(lines) // 2 :]
+            marker = json.dumps({"type": "log_rotated", "ts": time.time()}) + "\n"
+            offsets = []
+            pos = len(marker.encode("utf-8"))
             for line in keep:
-                await f.write(line)
-
-        # Reopen in append mode and reset byte counter.
-        self._file = await aiofiles.open(self._log_path, "a", encoding="utf-8")
-        self._bytes_written = sum(len(l.encode("utf-8", errors="replace")) for l in keep)
+                if line.startswith(_OUTPUT_PREFIXES_STR):
+                    offsets.append(pos)
+                pos += len(line.encode("utf-8", errors="replace"))
+            with open(self._log_path, "w", encoding="utf-8") as f:
+                f.write(marker)
+                f.writelines(keep)
+            fd = os.open(self._log_path, os.O_WRONLY | os.O_APPEND)
+            return fd, pos, offsets
+
+        self._fd, self._bytes_written, self.entry_offsets = await asyncio.to_thread(
+            _rewrite
+        )
+        self._thread = _LogWriteThread(self._fd)
+        self._thread.start()
 
 
 async def tail_log(log_path: str, n: int) -> list[dict]:
@@ -122,13 +257,14 @@ async def tail_log(log_path: str, n: int) -> list[dict]:
             lines = buffer.split(b"\n")
             # The first element may be a partial line — keep it for next iteration.
             buffer = lines[0]
+            # orjson parses the raw byte lines directly — no decode to str
+            # and no strip (surrounding whitespace is legal JSON framing).
             for raw_line in reversed(lines[1:]):
-                raw_line = raw_line.strip()
                 if not raw_line:
                     continue
                 try:
-                    record = json.loads(raw_line)
-                except (json.JSONDecodeError, UnicodeDecodeError):
+                    record = orjson.loads(raw_line)
+                except orjson.JSONDecodeError:
                     continue
                 if record.get("type") in ("stdout", "stderr", "output"):
                     entries.append({"type": record["type"], "data": record["data"]})
@@ -136,12 +272,12 @@ async def tail_log(log_path: str, n: int) -> list[dict]:
                         break
 
         # Process any remaining buffer content.
-        if buffer.strip() and len(entries) < n:
+        if buffer and len(entries) < n:
             try:
-                record = json.loads(buffer)
+                record = orjson.loads(buffer)
                 if record.get("type") in ("stdout", "stderr", "output"):
                     entries.append({"type": record["type"], "data": record["data"]})
-            except (json.JSONDecodeError, UnicodeDecodeError):
+            except orjson.JSONDecodeError:
                 pass
 
     entries.reverse()  # restore chronological order
@@ -154,16 +290,19 @@ async def log_process(background_process) -> None:
     When the file exceeds *MAX_PROCESS_LOG_SIZE*, the oldest half is
     discarded so the most recent output is always available.
     """
-    log_file = None
-    log_rotated = False
+    writer = None
     try:
         if background_process.log_path:
             await aiofiles.os.makedirs(
                 os.path.dirname(background_process.log_path), exist_ok=True
             )
-            log_file = await aiofiles.open(background_process.log_path, "a", encoding="utf-8")
-            await log_file.write(
-                json.dumps(
+            writer = await BoundedLogWriter.open(
+                background_process.log_path,
+                flush_interval=LOG_FLUSH_INTERVAL,
+                flush_buffer=LOG_FLUSH_BUFFER,
+            )
+            await writer.write(
+                orjson.dumps(
                     {
                         "type": "start",
                         "command": background_process.command,
@@ -171,26 +310,18 @@ async def log_process(background_process) -> None:
                         "ts": time.time(),
                     }
                 )
-                + "\n"
+                + b"\n"
             )
-            await log_file.flush()
+            await writer.flush()
     except OSError:
-        log_file = None
-
-    # Wrap the log file so it rotates when the size limit is reached.
-    writer = (
-        BoundedLogWriter(
-            log_file,
-            background_process.log_path,
-            flush_interval=LOG_FLUSH_INTERVAL,
-            flush_buffer=LOG_FLUSH_BUFFER,
-        )
-        if log_file
-        else None
-    )
+        writer = None
+
+    # Expose the writer so pollers can force a flush before reading the log.
+    background_process.log_writer = writer
 
     try:
-        await background_process.runner.read_output(writer)
+        async with _logger_semaphore:
+            await background_process.runner.read_output(writer)
     finally:
         log_rotated = writer.rotated if writer else False
         exit_code = await background_process.runner.wait()
@@ -199,11 +330,8 @@ async def log_process(background_process) -> None:
         background_process.finished_at = time.time()
         background_process.runner.close()
         if writer:
-            # Flush any buffered output before writing the end marker.
-            await writer.flush()
-        if log_file:
-            await log_file.write(
-                json.dumps(
+            await writer.write(
+                orjson.dumps(
                     {
                         "type": "end",
                         "exit_code": background_process.exit_code,
@@ -211,28 +339,88 @@ async def log_process(background_process) -> None:
                         "ts": time.time(),
                     }
                 )
-                + "\n"
+                + b"\n"
             )
-            await log_file.close()
+            await writer.close()
+
+
+def _scan_log_from(log_path: str, start: int) -> list[dict]:
+    """Read output entries from byte offset *start* to the end of the log."""
+    entries: list[dict] = []
+    with open(log_path, "rb") as f:
+        f.seek(start)
+        data = f.read()
+    for raw_line in data.split(b"\n"):
+        if not raw_line:
+            continue
+        try:
+            record = orjson.loads(raw_line)
+        except orjson.JSONDecodeError:
+            continue
+        if record.get("type") in ("stdout", "stderr", "output"):
+            entries.append({"type": record["type"], "data": record["data"]})
+    return entries
+
+
+def _scan_log_sync(log_path: str, offset: int) -> tuple[list[dict], int]:
+    """Scan a JSONL log, returning output entries after *offset* and the total count."""
+    entries: list[dict] = []
+    total = 0
+    with open(log_path, "rb") as f:
+        data = f.read()
+    for raw_line in data.split(b"\n"):
+        if not raw_line:
+            continue
+        try:
+            record = orjson.loads(raw_line)
+        except orjson.JSONDecodeError:
+            continue
+        if record.get("type") in ("stdout", "stderr", "output"):
+            total += 1
+            if total > offset:
+                entries.append({"type": record["type"], "data": record["data"]})
+    return entries, total
 
 
 async def read_log(
     log_path: Optional[str],
     offset: int = 0,
     tail: Optional[int] = None,
+    index: Optional[list[int]] = None,
 ) -> tuple[list[dict], int, bool]:
     """Read output entries from a JSONL log file.
 
     Returns ``(entries, next_offset, truncated)``.
 
-    When *tail* is specified and *offset* is 0, the file is read from the
-    end to avoid loading the entire file into memory — preventing the
-    memory spike that caused the OOM issue.
+    When *index* (the writer's ``entry_offsets``) is available, the read
+    seeks straight to the first requested record — O(returned entries)
+    per poll instead of re-counting the whole file.
+
+    Otherwise, when *tail* is specified and *offset* is 0, the file is
+    read from the end to avoid loading the entire file into memory —
+    preventing the memory spike that caused the OOM issue.
     """
     entries: list[dict] = []
     if not log_path or not await aiofiles.os.path.isfile(log_path):
         return entries, 0, False
 
+    # --- Indexed path: seek straight to the first requested record ---
+    if index is not None:
+        total = len(index)
+        start_idx = offset if tail is None else max(offset, total - tail)
+        if start_idx >= total:
+            return entries, total, False
+        entries = await asyncio.to_thread(_scan_log_from, log_path, index[start_idx])
+        # The index counts records as they are *buffered*, so it can run
+        # ahead of (or, mid-write, behind) what the scan finds on disk.
+        # Cap the slice at the snapshot and advance next_offset only by
+        # what was actually returned, so records buffered during the scan
+        # are delivered by the next poll instead of skipped or duplicated.
+        entries = entries[: total - start_idx]
+        next_offset = start_idx + len(entries)
+        truncated = tail is not None and (total - offset) > tail
+        return entries, next_offset, truncated
+
     # --- Optimised tail-from-end path ---
     if tail is not None and offset == 0:
         tail_entries = await tail_log(log_path, tail)
@@ -240,22 +428,11 @@ async def read_log(
         return tail_entries, len(tail_entries), truncated
 
     # --- Full scan path (bounded by offset) ---
-    async with aiofiles.open(log_path, encoding="utf-8") as f:
-        lines = await f.readlines()
-
-    for line in lines:
-        line = line.strip()
-        if not line:
-            continue
-        try:
-            record = json.loads(line)
-        except json.JSONDecodeError:
-            continue
-        if record.get("type") in ("stdout", "stderr", "output"):
-            entries.append({"type": record["type"], "data": record["data"]})
-
-    total = len(entries)
-    entries = entries[offset:]
+    # Read and parse in a worker thread: per-line JSON decoding of a large
+    # log would otherwise block the event loop for tens of ms.  A one-shot
+    # sync read beats aiofiles here (no per-call thread hop), and orjson
+    # parses the raw byte lines directly — no decode or strip needed.
+    entries, total = await asyncio.to_thread(_scan_log_sync, log_path, offset)
 
     truncated = False
     if tail is not None and len(entries) > tail:
@@ -1,5 +1,4 @@
 import asyncio
-import json
 import os
 import shlex
 import signal
@@ -7,6 +6,8 @@ import subprocess
 import time
 from abc import ABC, abstractmethod
 
+import orjson
+
 try:
     import fcntl
     import pty
@@ -33,8 +34,8 @@ class ProcessRunner(ABC):
         """Read output from the process and write entries to *log_file*."""
 
     @abstractmethod
-    def write_input(self, data: bytes) -> None:
-        """Send *data* to the process's stdin / PTY."""
+    async def write_input(self, data: bytes) -> None:
+        """Send *data* to the process's stdin / PTY, delivering all of it."""
 
     @abstractmethod
     def kill(self, force: bool = False) -> None:
@@ -82,31 +83,95 @@ class PtyRunner(ProcessRunner):
             os.close(master_fd)
             raise
         os.close(slave_fd)
+        # Non-blocking master side: read_output reads inline on the event
+        # loop and parks on the selector when no data is available, instead
+        # of paying two thread context switches per chunk via run_in_executor.
+        os.set_blocking(master_fd, False)
         self._master_fd = master_fd
 
+    async def _wait_readable(self, loop) -> None:
+        """Suspend until the master fd has data (one selector wakeup, no threads)."""
+        fut = loop.create_future()
+
+        def _on_readable():
+            if not fut.done():
+                fut.set_result(None)
+
+        loop.add_reader(self._master_fd, _on_readable)
+        try:
+            await fut
+        finally:
+            loop.remove_reader(self._master_fd)
+
+    async def _wait_writable(self, loop) -> None:
+        """Suspend until the master fd can accept more input."""
+        fut = loop.create_future()
+
+        def _on_writable():
+            if not fut.done():
+                fut.set_result(None)
+
+        loop.add_writer(self._master_fd, _on_writable)
+        try:
+            await fut
+        finally:
+            loop.remove_writer(self._master_fd)
+
     async def read_output(self, log_file) -> None:
         loop = asyncio.get_event_loop()
         while True:
-            try:
-                data = await loop.run_in_executor(None, os.read, self._master_fd, 4096)
+            # Drain everything the kernel has buffered in one tight loop
+            # (no awaits), so a single readable wakeup covers a burst of
+            # output instead of one read per loop iteration.  The pty
+            # buffer is bounded, so a batch is at most a few chunks.
+            chunks: list[bytes] = []
+            eof = False
+            while True:
+                try:
+                    data = os.read(self._master_fd, 65536)
+                except BlockingIOError:
+                    break
+                except OSError:
+                    eof = True  # EIO when child exits
+                    break
                 if not data:
+                    eof = True
                     break
-            except OSError:
-                break  # EIO when child exits
+                chunks.append(data)
             if log_file:
-                await log_file.write(
-                    json.dumps(
-                        {
-                            "type": "output",
-                            "data": data.decode(errors="replace"),
-                            "ts": time.time(),
-                        }
+                # One clock read per drained batch: the chunks arrived
+                # within the same wakeup, so they share a timestamp.
+                ts = time.time()
+                for data in chunks:
+                    await log_file.write(
+                        orjson.dumps(
+                            {
+                                "type": "output",
+                                "data": data.decode(errors="replace"),
+                                "ts": ts,
+                            }
+                        )
+                        + b"\n"
                     )
-                    + "\n"
-                )
-
-    def write_input(self, data: bytes) -> None:
-        os.write(self._master_fd, data)
+            if eof:
+                break
+            if not chunks:
+                await self._wait_readable(loop)
+
+    async def write_input(self, data: bytes) -> None:
+        # The master fd is non-blocking (for read_output), so one os.write
+        # accepts only what fits in the tty input buffer.  Loop over short
+        # writes and park on the selector when the buffer is full, so every
+        # byte is delivered.
+        loop = asyncio.get_event_loop()
+        view = memoryview(data)
+        while view:
+            try:
+                written = os.write(self._master_fd, view)
+            except BlockingIOError:
+                await self._wait_writable(loop)
+                continue
+            view = view[written:]
 
     def _signal_group(self, sig: int) -> None:
         """Send *sig* to the child's entire process group.
@@ -155,21 +220,30 @@ class PipeRunner(ProcessRunner):
             stdin=asyncio.subprocess.PIPE,
             cwd=self._cwd,
             env=self._env,
+            # 1 MiB StreamReader buffer (default 64 KiB): bursts from
+            # verbose commands don't trip the flow-control pause while
+            # the drain loop is still catching up.
+            limit=1 << 20,
         )
 
     async def read_output(self, log_file) -> None:
         async def read_stream(stream, label):
-            async for line in stream:
+            # Fixed-size reads rather than line iteration: per-line
+            # __anext__ rescans the buffer for newlines and allocates one
+            # bytes object per line, which adds up for tools emitting many
+            # short lines.  Records carry whatever arrived in the chunk;
+            # consumers treat data as a stream, not line-framed.
+            while data := await stream.read(65536):
                 if log_file:
                     await log_file.write(
-                        json.dumps(
+                        orjson.dumps(
                             {
                                 "type": label,
-                                "data": line.decode(errors="replace"),
+                                "data": data.decode(errors="replace"),
                                 "ts": time.time(),
                             }
                         )
-                        + "\n"
+                        + b"\n"
                     )
 
         await asyncio.gather(
@@ -177,7 +251,7 @@ class PipeRunner(ProcessRunner):
             read_stream(self._process.stderr, "stderr"),
         )
 
-    def write_input(self, data: bytes) -> None:
+    async def write_input(self, data: bytes) -> None:
         self._process.stdin.write(data)
 
     async def drain_input(self) -> None:
@@ -243,17 +317,17 @@ class WinPtyRunner(ProcessRunner):
                 continue
             if log_file:
                 await log_file.write(
-                    json.dumps(
+                    orjson.dumps(
                         {
                             "type": "output",
                             "data": data,
                             "ts": time.time(),
                         }
                     )
-                    + "\n"
+                    + b"\n"
                 )
 
-    def write_input(self, data: bytes) -> None:
+    async def write_input(self, data: bytes) -> None:
         self._pty.write(data.decode(errors="replace"))
 
     def kill(self, force: bool = False) -> None:
@@ -287,10 +361,16 @@ async def create_runner(
     run_as_user: str | None = None,
 ) -> ProcessRunner:
     """Factory: create a PTY runner on Unix, WinPTY runner on Windows, or pipe fallback."""
+    # PTY construction is synchronous openpty + fork/exec; run it in a
+    # worker thread so concurrent /execute calls don't serialize command
+    # launches on the event loop.  PipeRunner uses asyncio's own subprocess
+    # machinery, which must stay on the loop.
     if _PTY_AVAILABLE:
-        return PtyRunner(command, cwd, env, run_as_user=run_as_user)
+        return await asyncio.to_thread(
+            PtyRunner, command, cwd, env, run_as_user=run_as_user
+        )
     if _WINPTY_AVAILABLE:
-        return WinPtyRunner(command, cwd, env)
+        return await asyncio.to_thread(WinPtyRunner, command, cwd, env)
     runner = PipeRunner(command, cwd, env)
     await runner.start()
     return runner